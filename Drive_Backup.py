@@ -1,16 +1,30 @@
+import argparse
+import asyncio
+import hashlib
+import mimetypes
+import mmap
+import multiprocessing
 import os
+import queue
 import time
 import threading
+import json
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
+import aiofiles
+import aiohttp
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaUpload
 from googleapiclient.errors import HttpError
 
+from rate_limit import RateLimitedQueue
+
 # -------------------- CONFIG --------------------
 # OAuth files
 CLIENT_SECRET_FILE = os.getenv("GOOGLE_OAUTH_CLIENT_FILE", "credentials.json")
@@ -26,13 +40,38 @@ LOCAL_FOLDER = "D:\\Projects\\Drive_Backup_Threading\\Source"  # <-- change this
 PARENT_FOLDER_ID = None
 DRIVE_FOLDER_NAME = "Testing_Drive"   # used if PARENT_FOLDER_ID is None
 
-MAX_WORKERS = 4          # modest concurrency; increase carefully if you see 429s/403s
-CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB chunks for faster uploads
+MAX_WORKERS = 4          # starting concurrency; the limiter adapts it from here
+# Ceiling for the adaptive limit. The hot path is network-bound, so the knob
+# that matters is concurrency: the shared limiter starts at MAX_WORKERS,
+# climbs on clean-request streaks and halves on 429 (AIMD, like TCP), so the
+# uplink gets saturated without hand-tuning or retry storms.
+MAX_WORKERS_LIMIT = int(os.getenv("DRIVE_MAX_WORKERS_LIMIT", 16))
+# Resumable-upload chunk size. Bigger chunks = fewer request/response
+# round-trips per file, which is what dominates on a fat link. Drive wants a
+# multiple of 256 KiB (up to 100 MiB). Override with DRIVE_CHUNK_SIZE or --chunk-size.
+CHUNK_SIZE = int(os.getenv("DRIVE_CHUNK_SIZE", 32 * 1024 * 1024))
+SMALL_FILE_THRESHOLD = 5 * 1024 * 1024  # below this, skip the resumable protocol entirely
 MAX_RETRIES = 8
+
+# On-disk folder-name -> ID cache so repeat runs against a known folder skip
+# the lookup query entirely (entries re-verify after the TTL).
+FOLDER_CACHE_FILE = os.path.expanduser("~/.drive_backup_cache.json")
+FOLDER_CACHE_TTL = 24 * 3600  # seconds
 # ------------------------------------------------
 
 _thread_local = threading.local()
-_base_creds = None  # main process/user creds loaded once; cloned per thread
+_base_creds = None  # user creds loaded once per process; shared (reads are thread-safe)
+_service = None     # one discovery-built service per process, shared across threads
+_rate_limiter = RateLimitedQueue(MAX_WORKERS, max_limit=MAX_WORKERS_LIMIT)  # shared throttle state
+
+
+def _normalize_chunk_size(n: int) -> int:
+    """Round a requested chunk size down to Drive's 256 KiB quantum (min one quantum)."""
+    quantum = 256 * 1024
+    return max(quantum, (n // quantum) * quantum)
+
+
+CHUNK_SIZE = _normalize_chunk_size(CHUNK_SIZE)
 
 
 def _load_user_creds() -> Credentials:
@@ -57,65 +96,314 @@ def _load_user_creds() -> Credentials:
     return creds
 
 
+def _init_worker(creds_json: str, chunk_size: int):
+    """
+    ProcessPoolExecutor initializer: rebuild credentials once per child
+    process (nothing httplib2-related is shared across processes) and carry
+    over any CLI-tuned chunk size, since spawned children re-import this
+    module with the defaults.
+    """
+    global _base_creds, CHUNK_SIZE
+    _base_creds = Credentials.from_authorized_user_info(json.loads(creds_json), SCOPES)
+    CHUNK_SIZE = chunk_size
+
+
 def _make_service_from_creds(creds: Credentials):
-    return build("drive", "v3", credentials=creds, cache_discovery=False)
-
-
-def _make_service_for_thread():
-    """
-    Each thread uses its own Drive service instance.
-    We reuse the same user creds but construct a new service per thread.
-    """
-    svc = getattr(_thread_local, "drive_service", None)
-    if svc is not None:
-        return svc
-    # Clone credentials for safety (google-auth Credentials are thread-safe for reads,
-    # but we avoid sharing mutable state)
-    thread_creds = Credentials(
-        token=_base_creds.token,
-        refresh_token=_base_creds.refresh_token,
-        token_uri=_base_creds.token_uri,
-        client_id=_base_creds.client_id,
-        client_secret=_base_creds.client_secret,
-        scopes=_base_creds.scopes,
-    )
-    _thread_local.drive_service = _make_service_from_creds(thread_creds)
-    return _thread_local.drive_service
+    # static_discovery uses the discovery doc bundled with the client library,
+    # so cold start skips fetching + parsing ~1 MB of JSON over HTTPS.
+    return build("drive", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
 
 
-def _ensure_drive_folder(folder_name: str) -> str:
+def _get_service():
+    """
+    Build the Drive service once per process. The expensive part of build()
+    is parsing the discovery document; the resulting object is just request
+    plumbing and safe to share as long as we never use its bundled http.
+    """
+    global _service
+    if _service is None:
+        _service = _make_service_from_creds(_base_creds)
+    return _service
+
+
+def _thread_http() -> AuthorizedHttp:
+    """
+    httplib2.Http is not thread-safe, so each worker keeps one lightweight
+    AuthorizedHttp and passes it explicitly to execute()/next_chunk().
+    Much cheaper than the old per-thread cred-clone + full service rebuild.
     """
-    Create (or fetch) a *My Drive* folder by name and return its ID.
+    http = getattr(_thread_local, "authed_http", None)
+    if http is None:
+        http = AuthorizedHttp(_base_creds, http=httplib2.Http())
+        _thread_local.authed_http = http
+    return http
+
+
+def _load_folder_cache() -> dict:
+    try:
+        with open(FOLDER_CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_folder_cache(cache: dict):
+    try:
+        with open(FOLDER_CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # the cache is best-effort; never fail an upload over it
+
+
+def _invalidate_folder_cache(folder_name: str):
+    """Drop a cached folder ID (e.g. after a 404 because it was deleted)."""
+    cache = _load_folder_cache()
+    if cache.pop(folder_name, None) is not None:
+        _save_folder_cache(cache)
+
+
+def _ensure_drive_folder_batch(folder_names: list[str]) -> dict[str, str]:
+    """
+    Create (or fetch) several *My Drive* folders by name; returns name -> ID.
+    All lookups ride in one BatchHttpRequest (Drive packs up to 100 ops per
+    HTTP request), and any misses are created in a second batch — so N
+    metadata round-trips collapse to ceil(N/100) + ceil(misses/100).
     Note: name lookup is not unique; we pick the first match.
     """
-    service = _make_service_for_thread()
+    service = _get_service()
+    http = _thread_http()
+    ids: dict[str, str] = {}
+    names = list(dict.fromkeys(folder_names))
+
+    # Cached IDs short-circuit the lookup round-trip entirely on repeat runs.
+    cache = _load_folder_cache()
+    now = time.time()
+    for name in names:
+        entry = cache.get(name)
+        if entry and now - entry.get("ts", 0) < FOLDER_CACHE_TTL:
+            ids[name] = entry["id"]
+    pending = [n for n in names if n not in ids]
+
+    def _batches(seq, n=100):
+        for i in range(0, len(seq), n):
+            yield seq[i:i + n]
+
+    def _on_list(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        files = response.get("files", [])
+        if files:
+            ids[request_id] = files[0]["id"]
+
+    for group in _batches(pending):
+        batch = service.new_batch_http_request(callback=_on_list)
+        for name in group:
+            # Escape single quotes just in case
+            safe = name.replace("'", "\\'")
+            batch.add(
+                service.files().list(
+                    q=f"mimeType='application/vnd.google-apps.folder' and name='{safe}' and trashed=false",
+                    spaces="drive",
+                    fields="files(id, name)",
+                    pageSize=10,
+                ),
+                request_id=name,
+            )
+        batch.execute(http=http)
+
+    def _on_create(request_id, response, exception):
+        if exception is not None:
+            raise exception
+        ids[request_id] = response["id"]
+
+    missing = [n for n in pending if n not in ids]
+    for group in _batches(missing):
+        batch = service.new_batch_http_request(callback=_on_create)
+        for name in group:
+            metadata = {
+                "name": name,
+                "mimeType": "application/vnd.google-apps.folder",
+            }
+            batch.add(service.files().create(body=metadata, fields="id, name"), request_id=name)
+        batch.execute(http=http)
+
+    if pending:
+        for name in pending:
+            if name in ids:
+                cache[name] = {"id": ids[name], "ts": now}
+        _save_folder_cache(cache)
+
+    return ids
 
-    # Escape single quotes just in case
-    safe = folder_name.replace("'", "\\'")
-    resp = service.files().list(
-        q=f"mimeType='application/vnd.google-apps.folder' and name='{safe}' and trashed=false",
-        spaces="drive",
-        fields="files(id, name)",
-        pageSize=10,
-    ).execute()
 
-    files = resp.get("files", [])
-    if files:
-        return files[0]["id"]
+def _ensure_drive_folder(folder_name: str) -> str:
+    """Create (or fetch) a single *My Drive* folder by name and return its ID."""
+    return _ensure_drive_folder_batch([folder_name])[folder_name]
 
-    metadata = {
-        "name": folder_name,
-        "mimeType": "application/vnd.google-apps.folder",
-    }
-    created = service.files().create(body=metadata, fields="id, name").execute()
-    return created["id"]
+
+def _md5_of(path: str) -> str:
+    """
+    MD5 of a whole file, mmap-fed so OpenSSL's (hardware-accelerated) MD5 sees
+    the data in one go instead of a Python read loop with per-chunk copies.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return hashlib.md5(b"").hexdigest()
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.md5(memoryview(mm)).hexdigest()
+
+
+def _list_existing(parent_id: str) -> dict[str, dict]:
+    """
+    Map name -> file metadata (id, size, md5Checksum) for everything already
+    in the destination Drive folder. One list() call per 1000 files.
+    """
+    service = _get_service()
+    http = _thread_http()
+    existing: dict[str, dict] = {}
+    page_token = None
+    while True:
+        resp = service.files().list(
+            q=f"'{parent_id}' in parents and trashed=false",
+            spaces="drive",
+            fields="nextPageToken, files(id, name, size, md5Checksum)",
+            pageSize=1000,
+            pageToken=page_token,
+        ).execute(http=http)
+        for f in resp.get("files", []):
+            existing.setdefault(f["name"], f)
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            return existing
+
+
+class MediaMmapUpload(MediaUpload):
+    """
+    Resumable upload media backed by an mmap of the file instead of
+    open().read(chunksize). MediaFileUpload allocates a fresh chunksize-d
+    bytes object per chunk per worker; here getbytes() slices the map, so the
+    only copy left is the one into the request body and the page cache backs
+    the rest. Not for empty files (mmap rejects length 0), which the
+    small-file path never sends here anyway.
+    """
+
+    def __init__(self, filename: str, mimetype: str | None = None,
+                 chunksize: int = CHUNK_SIZE, resumable: bool = True):
+        super().__init__()
+        self._filename = filename
+        if mimetype is None:
+            mimetype, _ = mimetypes.guess_type(filename)
+        self._mimetype = mimetype or "application/octet-stream"
+        self._chunksize = chunksize
+        self._resumable = resumable
+        self._fh = open(filename, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        # Tell the kernel we read front-to-back so it ramps readahead up
+        # instead of treating page faults as random access (Linux/macOS).
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+
+    def _prefetch(self, offset: int):
+        """
+        Ask the kernel to fault in the next chunk while the current one is on
+        the wire, so multi-GB videos overlap disk reads with network sends
+        rather than stalling each next_chunk() on cold pages.
+        """
+        if not hasattr(mmap, "MADV_WILLNEED"):
+            return
+        size = self._mm.size()
+        if offset >= size:
+            return
+        aligned = offset - (offset % mmap.PAGESIZE)
+        length = min(self._chunksize + (offset - aligned), size - aligned)
+        try:
+            self._mm.madvise(mmap.MADV_WILLNEED, aligned, length)
+        except OSError:
+            pass  # advisory only
+
+    def chunksize(self) -> int:
+        return self._chunksize
+
+    def mimetype(self) -> str:
+        return self._mimetype
+
+    def size(self) -> int:
+        return self._mm.size()
+
+    def resumable(self) -> bool:
+        return self._resumable
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        self._prefetch(begin + length)
+        return bytes(memoryview(self._mm)[begin:begin + length])
+
+    def has_stream(self) -> bool:
+        return True
+
+    def stream(self):
+        # mmap objects are file-like (seek/read/tell), so next_chunk() wraps
+        # the map in a _StreamSlice and httplib streams it to the socket in
+        # ~8 KiB blocks with an explicit Content-Length. That removes the
+        # second, chunk-sized buffer googleapiclient otherwise builds via
+        # getbytes() — per-chunk resident cost drops from chunksize to one
+        # socket block. The map position at this point is the end of the
+        # previously sent chunk, i.e. the start of the one about to go out.
+        self._prefetch(self._mm.tell())
+        return self._mm
+
+
+def _needs_upload(path: str, remote: dict | None, verify_md5: bool) -> bool:
+    """
+    Decide whether a local file still needs uploading, given the metadata of
+    the same-named remote file (None = not present). The default check is
+    size equality — no hashing, and usually sufficient for backups. With
+    verify_md5, a size match is additionally checked against Drive's stored
+    md5Checksum, which catches same-size content changes at the cost of one
+    local hash pass.
+    """
+    if remote is None:
+        return True
+    if remote.get("size") is None or int(remote["size"]) != os.path.getsize(path):
+        return True
+    if verify_md5:
+        md5 = remote.get("md5Checksum")
+        return not md5 or md5 != _md5_of(path)
+    return False
+
+
+def _retry_after_of(e: HttpError) -> float | None:
+    """Best-effort Retry-After (seconds) from an HttpError's response headers."""
+    resp = getattr(e, "resp", None)
+    try:
+        return float(resp.get("retry-after")) if resp is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _chunksize_for(size: int) -> int:
+    """
+    Pick a resumable chunksize for a file of `size` bytes: round up to the
+    256 KiB quantum Drive requires, but don't allocate more than the file needs.
+    """
+    quantum = 256 * 1024
+    rounded = ((size // quantum) + 1) * quantum
+    return min(CHUNK_SIZE, max(quantum, rounded))
 
 
 def _upload_with_resumable(file_path: str, display_name: str, parent_id: str) -> dict:
-    service = _make_service_for_thread()
+    service = _get_service()
+    http = _thread_http()
     file_metadata = {"name": display_name, "parents": [parent_id]}
 
-    media = MediaFileUpload(file_path, resumable=True, chunksize=CHUNK_SIZE)
+    size = os.path.getsize(file_path)
+    # Small files: a resumable session costs an extra round-trip and an
+    # 8 MiB buffer per worker for no benefit. Send them in one shot.
+    small = size <= SMALL_FILE_THRESHOLD
+    if small:
+        media = MediaFileUpload(file_path, resumable=False)
+    else:
+        media = MediaMmapUpload(file_path, chunksize=_chunksize_for(size))
 
     request = service.files().create(
         body=file_metadata,
@@ -125,34 +413,181 @@ def _upload_with_resumable(file_path: str, display_name: str, parent_id: str) ->
 
     backoff = 1.0
     tries = 0
+    # Progress reporting is throttled: stdout writes are GIL-serialized, so a
+    # print per chunk across the whole pool turns into lock contention.
+    last_pct = 0
+    last_report = time.monotonic()
 
     while True:
+        sleep_for = None
+        _rate_limiter.acquire()
         try:
-            status, response = request.next_chunk()
+            if small:
+                response = request.execute(http=http)
+                _rate_limiter.success()
+                return response
+            status, response = request.next_chunk(http=http)
+            _rate_limiter.success()
             if response is not None:
                 return response
             if status:
-                print(f"[{threading.current_thread().name}] {display_name}: {int(status.progress() * 100)}%")
+                pct = int(status.progress() * 100)
+                now = time.monotonic()
+                if pct - last_pct >= 10 or now - last_report >= 2:
+                    last_pct = pct
+                    last_report = now
+                    print(f"[{threading.current_thread().name}] {display_name}: {pct}%")
         except HttpError as e:
             code = getattr(e, "status_code", None) or getattr(e, "resp", getattr(e, "response", None))
             code = getattr(code, "status", None) or getattr(code, "status_code", None) or getattr(e, "resp", None) and e.resp.status
             code = code or 0  # best-effort
 
+            if code == 429 or (code == 403 and "ratelimitexceeded" in str(e).lower()):
+                # Throttle the whole pool, not just this task, so the other
+                # workers stop hammering while the server is shedding load.
+                _rate_limiter.rate_limit(_retry_after_of(e))
+
             if code in (403, 408, 429, 500, 502, 503, 504) and tries < MAX_RETRIES:
                 tries += 1
                 print(f"[{threading.current_thread().name}] {display_name}: transient {code}, sleep {backoff:.1f}s (retry {tries}/{MAX_RETRIES})")
-                time.sleep(backoff)
+                sleep_for = backoff
                 backoff = min(backoff * 2, 32)
-                continue
-            raise
+            else:
+                raise
+        finally:
+            _rate_limiter.release()
+        if sleep_for is not None:
+            # back off without holding a concurrency slot
+            time.sleep(sleep_for)
 
 
-def _gather_mp4s(folder: str) -> list[tuple[str, str]]:
-    p = Path(folder)
-    return [(str(f), f.name) for f in sorted(p.glob("*.mp4"))]
+_RESUMABLE_INIT_URL = "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable"
+_TRANSIENT_CODES = (403, 408, 429, 500, 502, 503, 504)
+_SEND_BLOCK = 64 * 1024  # socket-write granularity when streaming a chunk from disk
 
 
-def upload_folder_of_videos(local_folder: str, parent_folder_id: str | None, drive_folder_name: str | None):
+async def _file_range_sender(f, remaining: int):
+    """
+    Yield `remaining` bytes from `f` in small blocks so aiohttp writes them
+    straight to the socket. This keeps per-upload memory at _SEND_BLOCK
+    instead of a full CHUNK_SIZE staging buffer. (True sendfile(2) is off the
+    table here: the kernel can't splice through a user-space TLS socket.)
+    """
+    while remaining > 0:
+        block = await f.read(min(_SEND_BLOCK, remaining))
+        if not block:
+            raise OSError("file shrank while uploading")
+        remaining -= len(block)
+        yield block
+
+
+async def _start_upload_session(session: aiohttp.ClientSession, display_name: str,
+                                parent_id: str, token: str, size: int) -> str:
+    """POST the file metadata and return the resumable session URI from Location."""
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json; charset=UTF-8",
+        "X-Upload-Content-Length": str(size),
+    }
+    body = {"name": display_name, "parents": [parent_id]}
+    async with session.post(_RESUMABLE_INIT_URL, headers=headers, json=body,
+                            allow_redirects=False) as resp:
+        resp.raise_for_status()
+        return resp.headers["Location"]
+
+
+async def _upload_async(session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                        file_path: str, display_name: str, parent_id: str, token: str) -> dict:
+    """
+    Upload one file over a resumable session using plain aiohttp PUTs.
+    All uploads share one event-loop thread; `sem` caps how many are inflight,
+    so concurrency costs a coroutine instead of an OS thread stack.
+    """
+    size = os.path.getsize(file_path)
+
+    async with sem:
+        backoff = 1.0
+        tries = 0
+        while True:
+            try:
+                session_uri = await _start_upload_session(session, display_name, parent_id, token, size)
+                async with aiofiles.open(file_path, "rb") as f:
+                    offset = 0
+                    while True:
+                        part = min(CHUNK_SIZE, size - offset)
+                        if part:
+                            content_range = f"bytes {offset}-{offset + part - 1}/{size}"
+                            body = _file_range_sender(f, part)
+                        else:
+                            # empty file: a single zero-length PUT finalizes the session
+                            content_range = f"bytes */{size}"
+                            body = b""
+                        headers = {
+                            "Authorization": f"Bearer {token}",
+                            "Content-Length": str(part),
+                            "Content-Range": content_range,
+                        }
+                        # allow_redirects=False: Drive answers intermediate
+                        # chunks with 308 Resume Incomplete, which aiohttp
+                        # would otherwise treat as a redirect — fatal with a
+                        # non-replayable generator body.
+                        async with session.put(session_uri, headers=headers, data=body,
+                                               allow_redirects=False) as resp:
+                            if resp.status in (200, 201):
+                                return await resp.json()
+                            if resp.status != 308:
+                                resp.raise_for_status()
+                        offset += part
+            except aiohttp.ClientError as e:
+                code = getattr(e, "status", 0) or 0
+                if code in _TRANSIENT_CODES and tries < MAX_RETRIES:
+                    tries += 1
+                    print(f"[async] {display_name}: transient {code}, sleep {backoff:.1f}s (retry {tries}/{MAX_RETRIES})")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 32)
+                    continue
+                raise
+
+
+async def _upload_all_async(files: list[tuple[str, str]], parent_id: str, token: str) -> list[dict]:
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    results = []
+    # One pooled connector for every session-init POST and chunk PUT: at most
+    # MAX_WORKERS TCP+TLS connections, kept alive between chunks so the
+    # handshake is paid once per connection instead of once per request.
+    connector = aiohttp.TCPConnector(limit=MAX_WORKERS, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            asyncio.create_task(_upload_async(session, sem, path, name, parent_id, token))
+            for path, name in files
+        ]
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    for (path, name), outcome in zip(files, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"FAILED: {name} -> {outcome}")
+        else:
+            results.append(outcome)
+            link = outcome.get("webViewLink", "(no link)")
+            print(f"Uploaded: {name} -> fileId={outcome['id']} | {link}")
+    return results
+
+
+def _gather_mp4s(folder: str) -> list[tuple[str, str]]:
+    # os.scandir hands back DirEntry objects with cached type info, so huge
+    # folders cost one readdir batch instead of a stat() per entry.
+    with os.scandir(folder) as it:
+        items = [
+            (e.path, e.name)
+            for e in it
+            if e.name.endswith(".mp4") and e.is_file(follow_symlinks=False)
+        ]
+    items.sort(key=lambda t: t[1])
+    return items
+
+
+def upload_folder_of_videos(local_folder: str, parent_folder_id: str | None,
+                            drive_folder_name: str | None, use_async: bool = False,
+                            use_processes: bool = False, verify_md5: bool = False):
     # Resolve target folder in *your* My Drive
     if parent_folder_id:
         target_folder_id = parent_folder_id
@@ -166,14 +601,75 @@ def upload_folder_of_videos(local_folder: str, parent_folder_id: str | None, dri
         print("No .mp4 files found.")
         return []
 
-    print(f"Uploading {len(files)} video(s) to Drive folder ID: {target_folder_id}")
+    # Skip anything already sitting in the destination folder: one list()
+    # call and a (name, size) comparison turn a re-run into a no-op without
+    # touching file contents. --verify-md5 additionally checks size matches
+    # against Drive's stored md5Checksum.
+    existing = _list_existing(target_folder_id)
+
+    if use_async:
+        if existing:
+            files = [(p, n) for p, n in files if _needs_upload(p, existing.get(n), verify_md5)]
+        if not files:
+            print("Nothing to upload; everything is already in Drive.")
+            return []
+        print(f"Uploading {len(files)} video(s) to Drive folder ID: {target_folder_id}")
+        # One event loop instead of MAX_WORKERS blocked threads; the Drive
+        # service is still used above for folder resolution.
+        return asyncio.run(_upload_all_async(files, target_folder_id, _base_creds.token))
+
+    # Producer/consumer pipeline: one hasher thread runs the preflight check
+    # (stat, plus an MD5 pass under --verify-md5) and feeds a bounded queue,
+    # while the pool uploads earlier files — so hashing file N+1 overlaps
+    # sending file N instead of serializing in front of the whole batch.
+    work: queue.Queue = queue.Queue(maxsize=MAX_WORKERS * 2)
+
+    def _produce():
+        # The sentinel must go out no matter what, or the consumer blocks on
+        # work.get() forever; per-file preflight errors (file deleted between
+        # scandir and here, unreadable under --verify-md5) just skip that file.
+        try:
+            for path, name in files:
+                try:
+                    if existing and not _needs_upload(path, existing.get(name), verify_md5):
+                        print(f"Skipping (already uploaded): {name}")
+                        continue
+                except OSError as exc:
+                    print(f"FAILED: {name} -> {exc}")
+                    continue
+                work.put((path, name))
+        finally:
+            work.put(None)  # sentinel: no more uploads coming
+
+    if use_processes:
+        # TLS record processing holds the GIL in spots; separate interpreters
+        # sidestep that entirely at the cost of one auth + service per child.
+        # Spawn (not fork) the children: the producer thread is running by the
+        # time workers start, and forking a multi-threaded process is unsafe.
+        pool = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(_base_creds.to_json(), CHUNK_SIZE),
+        )
+    else:
+        # Size the pool at the ceiling; how many workers actually touch the
+        # network at once is governed by the adaptive shared limiter.
+        pool = ThreadPoolExecutor(max_workers=MAX_WORKERS_LIMIT, thread_name_prefix="drive-up")
+
+    threading.Thread(target=_produce, name="drive-hash", daemon=True).start()
+
+    print(f"Uploading to Drive folder ID: {target_folder_id}")
 
     results = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="drive-up") as pool:
-        futs = {
-            pool.submit(_upload_with_resumable, path, name, target_folder_id): (path, name)
-            for path, name in files
-        }
+    with pool:
+        futs = {}
+        while (item := work.get()) is not None:
+            path, name = item
+            futs[pool.submit(_upload_with_resumable, path, name, target_folder_id)] = (path, name)
+        if not futs:
+            print("Nothing to upload; everything is already in Drive.")
+            return []
         for fut in as_completed(futs):
             path, name = futs[fut]
             try:
@@ -182,11 +678,53 @@ def upload_folder_of_videos(local_folder: str, parent_folder_id: str | None, dri
                 link = resp.get("webViewLink", "(no link)")
                 print(f"Uploaded: {name} -> fileId={resp['id']} | {link}")
             except Exception as exc:
+                if (drive_folder_name and isinstance(exc, HttpError)
+                        and getattr(exc.resp, "status", None) == 404):
+                    # stale cached folder ID (folder deleted?) — forget it so
+                    # the next run looks the folder up again
+                    _invalidate_folder_cache(drive_folder_name)
                 print(f"FAILED: {name} -> {exc}")
     return results
 
 
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Back up a local folder of videos to Google Drive using threaded uploads."
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help=f"resumable upload chunk size in bytes, rounded to a 256 KiB multiple "
+             f"(default {CHUNK_SIZE}; also settable via DRIVE_CHUNK_SIZE)",
+    )
+    parser.add_argument(
+        "--use-async",
+        action="store_true",
+        help="upload over aiohttp on a single event loop instead of worker threads",
+    )
+    parser.add_argument(
+        "--process-pool",
+        action="store_true",
+        help="run uploads in worker processes instead of threads (no GIL sharing)",
+    )
+    parser.add_argument(
+        "--verify-md5",
+        action="store_true",
+        help="when name and size match a remote file, also compare MD5 before skipping",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    # Load user creds once, then use per-thread services made from them
+    args = _parse_args()
+    if args.chunk_size is not None:
+        CHUNK_SIZE = _normalize_chunk_size(args.chunk_size)
+
+    # Load user creds once; the Drive service is built lazily once per process
+    # and workers each carry their own AuthorizedHttp
     _base_creds = _load_user_creds()
-    upload_folder_of_videos(LOCAL_FOLDER, PARENT_FOLDER_ID, DRIVE_FOLDER_NAME)
+    upload_folder_of_videos(LOCAL_FOLDER, PARENT_FOLDER_ID, DRIVE_FOLDER_NAME,
+                            use_async=args.use_async, use_processes=args.process_pool,
+                            verify_md5=args.verify_md5)
@@ -1,9 +1,15 @@
+# NOTE: legacy first-pass uploader, kept only to show the progression — use
+# Drive_Backup.py at the repo root instead. This version builds MediaFileUpload
+# without a chunksize, so resumable uploads buffer the entire file in memory
+# (OOM risk on large videos).
+
 import os
 import threading
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import time
@@ -33,36 +39,43 @@ def authenticate_google_drive():
     service = build('drive', 'v3', credentials=creds)
     return service
 
+# Built once at import; get_mime_type used to rebuild this dict (and allocate
+# a split() list) on every call during the submit phase.
+_MIME_TYPES = {
+    '.mp4': 'video/mp4',
+    '.txt': 'text/plain',
+    '.jpg': 'image/jpeg',
+    '.png': 'image/png',
+    '.pdf': 'application/pdf',
+}
+
 def get_mime_type(file_path):
     """Return the MIME type for a file."""
-    extension = file_path.split('.')[-1].lower()
-    mime_types = {
-        'mp4': 'video/mp4',
-        'txt': 'text/plain',
-        'jpg': 'image/jpeg',
-        'png': 'image/png',
-        'pdf': 'application/pdf',
-    }
-    return mime_types.get(extension, 'application/octet-stream')
+    return _MIME_TYPES.get(os.path.splitext(file_path)[1].lower(), 'application/octet-stream')
 
 def upload_file(service, file_path, parent_folder_id=None):
-    """Upload a single file to Google Drive."""
-    try:
-        file_metadata = {'name': os.path.basename(file_path)}
-        if parent_folder_id:
-            file_metadata['parents'] = [parent_folder_id]
-        
-        mime_type = get_mime_type(file_path)
-        media = MediaFileUpload(file_path, resumable=True, mimetype=mime_type)
+    """Upload a single file to Google Drive, retrying transient errors at most 3 times."""
+    file_metadata = {'name': os.path.basename(file_path)}
+    if parent_folder_id:
+        file_metadata['parents'] = [parent_folder_id]
+
+    mime_type = get_mime_type(file_path)
 
-        # Request to upload the file
-        request = service.files().create(body=file_metadata, media_body=media, fields='id')
-        response = request.execute()
-        print(f"Uploaded: {file_path} with file ID: {response['id']}")
-    except Exception as e:
-        print(f"Error uploading {file_path}: {e}")
-        time.sleep(5)  # Wait before retrying in case of network failure
-        upload_file(service, file_path, parent_folder_id)  # Retry on failure
+    # Bounded loop with exponential backoff; the old version recursed on any
+    # exception, so one flaky network could grow the stack without limit and
+    # leave duplicate files on the server.
+    for attempt in range(3):
+        try:
+            media = MediaFileUpload(file_path, resumable=True, mimetype=mime_type)
+            request = service.files().create(body=file_metadata, media_body=media, fields='id')
+            response = request.execute()
+            print(f"Uploaded: {file_path} with file ID: {response['id']}")
+            return
+        except HttpError as e:
+            if e.resp.status not in (429, 500, 502, 503, 504) or attempt == 2:
+                raise
+            print(f"Error uploading {file_path}: {e}; retrying in {2 ** attempt}s")
+            time.sleep(2 ** attempt)
 
 def upload_files_concurrently(service, files, parent_folder_id=None, max_threads=5):
     """Upload multiple files concurrently using a thread pool."""
@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+class RateLimitedQueue:
+    """
+    Shared concurrency limit for the upload workers.
+
+    Per-task exponential backoff alone has a failure mode: when Drive 429s one
+    worker, the other MAX_WORKERS-1 keep hammering and collect their own 429s.
+    Here all workers call acquire()/release() around each network call and
+    consult one shared limit. On a throttle response, rate_limit() halves the
+    limit (remembering the old value as the known-bad upper bound) and pauses
+    *everyone* for the server's Retry-After; streaks of clean calls feed
+    success(), which climbs back toward that bound binary-search style.
+
+    The queue is per-process, so in --process-pool mode each child coordinates
+    its own workers independently.
+    """
+
+    # clean calls needed before we try raising the limit again
+    STREAK = 2
+
+    def __init__(self, limit: int, min_limit: int = 1, max_limit: int | None = None):
+        self._cond = threading.Condition()
+        self._limit = limit
+        self._min = min_limit
+        self._max = max_limit if max_limit is not None else limit
+        self._upper = self._max  # lowest limit observed to draw throttling
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._clean_streak = 0
+
+    @property
+    def limit(self) -> int:
+        with self._cond:
+            return self._limit
+
+    def acquire(self):
+        """Block until a slot is free and no throttle hold is active."""
+        with self._cond:
+            while True:
+                remaining = self._paused_until - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                if self._in_flight < self._limit:
+                    self._in_flight += 1
+                    return
+                self._cond.wait()
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def rate_limit(self, retry_after: float | None = None):
+        """The server asked us to slow down: halve the limit, pause all workers."""
+        with self._cond:
+            self._upper = max(self._limit, self._min)
+            self._limit = max(self._min, self._limit // 2)
+            self._clean_streak = 0
+            hold = retry_after if retry_after and retry_after > 0 else 1.0
+            self._paused_until = max(self._paused_until, time.monotonic() + hold)
+            self._cond.notify_all()
+
+    def success(self):
+        """Record a clean call; every STREAK of them nudges the limit back up."""
+        with self._cond:
+            self._clean_streak += 1
+            if self._clean_streak >= self.STREAK:
+                self._clean_streak = 0
+                self._increase_limit_locked()
+
+    def increase_limit(self):
+        with self._cond:
+            self._increase_limit_locked()
+
+    def _increase_limit_locked(self):
+        if self._limit < self._upper:
+            # climb halfway back toward the last level that drew a throttle
+            self._limit = min(self._upper, (self._limit + self._upper + 1) // 2)
+        elif self._limit < self._max:
+            self._upper = min(self._max, self._upper + 1)
+            self._limit = self._upper
+        self._cond.notify_all()